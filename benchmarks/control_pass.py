@@ -0,0 +1,144 @@
+"""Micro-benchmark for a single thermostat control pass.
+
+Measures the event-loop cost of ``async_control_fan`` as run on every
+temperature update, with debug logging disabled as in a normal install.
+Scheduled coroutines are counted and run to completion inline against a
+service registry that drops every call, so the cost of building payloads and
+log messages in the switch helpers is included.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/control_pass.py
+    python benchmarks/control_pass.py --against <git revision>
+
+With ``--against`` the same benchmark also runs on the integration as of that
+revision, checked out into a temporary git worktree, and prints both results.
+"""
+import argparse
+import inspect
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Constructor arguments by name, so older versions with fewer options still run
+THERMOSTAT_ARGS = {
+    "unique_id": "benchmark",
+    "current_temp_entity_id": "sensor.room_temperature",
+    "fan_entity_id": "fan.fan_coil",
+    "cooling_switches": ["switch.chiller_pump", "switch.cooling_valve"],
+    "heating_switches": ["switch.boiler_pump", "switch.heating_valve"],
+    "min_temp": 15.0,
+    "max_temp": 30.0,
+    "target_temp": 22.0,
+    "temp_step": 0.5,
+    "heat_cool_deadband": 2.0,
+    "changeover_lockout": 30,
+    "decision_budget": 0,
+}
+
+
+class _FakeServices:
+    """Service registry that accepts and drops every call."""
+
+    async def async_call(self, *args, **kwargs):
+        """Drop the service call."""
+
+
+class _FakeHass:
+    """Minimal stand-in for the parts of HomeAssistant a control pass touches."""
+
+    def __init__(self):
+        """Initialize the fake."""
+        self.services = _FakeServices()
+        self.tasks = 0
+
+    def async_create_task(self, target, *args, **kwargs):
+        """Count the task and run the coroutine, which never suspends here."""
+        self.tasks += 1
+        try:
+            target.send(None)
+        except StopIteration:
+            pass
+
+
+def run(repo, passes, repeat):
+    """Benchmark the integration found in ``repo`` and print the per-pass cost."""
+    sys.path.insert(0, repo)
+
+    from homeassistant.components.climate import HVACMode
+
+    from custom_components.generic_fan_coil_thermostat.climate import (
+        GenericFanCoilThermostat,
+    )
+
+    parameters = inspect.signature(GenericFanCoilThermostat.__init__).parameters
+    hass = _FakeHass()
+    thermostat = GenericFanCoilThermostat(
+        hass,
+        **{name: value for name, value in THERMOSTAT_ARGS.items() if name in parameters},
+    )
+    thermostat._attr_hvac_mode = HVACMode.HEAT
+    thermostat._attr_current_temperature = 20.5
+
+    best = min(
+        timeit.repeat(thermostat.async_control_fan, number=passes, repeat=repeat)
+    )
+    tasks_per_pass = hass.tasks / (passes * repeat)
+    print(f"{best / passes * 1e6:.2f} µs per control pass")
+    print(f"{tasks_per_pass:.1f} tasks created per control pass")
+
+
+def main():
+    """Run the benchmark, optionally against an earlier revision as well."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--against", metavar="REV", help="also benchmark this git revision"
+    )
+    parser.add_argument("--repo", default=REPO_ROOT, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.against is None:
+        run(args.repo, args.passes, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        worktree = os.path.join(tmp_dir, "tree")
+        subprocess.run(
+            ["git", "-C", REPO_ROOT, "worktree", "add", "--detach", "-q", worktree, args.against],
+            check=True,
+        )
+        try:
+            for label, repo in ((args.against, worktree), ("working tree", REPO_ROOT)):
+                print(f"{label}:", flush=True)
+                # Each version is imported in its own interpreter
+                subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath(__file__),
+                        "--passes",
+                        str(args.passes),
+                        "--repeat",
+                        str(args.repeat),
+                        "--repo",
+                        repo,
+                    ],
+                    check=True,
+                )
+        finally:
+            subprocess.run(
+                ["git", "-C", REPO_ROOT, "worktree", "remove", "--force", worktree],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Climate platform for Generic Fan Coil Thermostat integration."""
 import logging
+import time
+from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
 import voluptuous as vol
@@ -24,19 +26,40 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_HEAT_COOL_SIDE,
+    ATTR_LAST_CHANGEOVER,
+    ATTR_PRESTART_AT,
+    ATTR_SAVED_TARGET_TEMP_HIGH,
+    ATTR_SAVED_TARGET_TEMP_LOW,
+    ATTR_SAVED_TEMPERATURE,
+    ATTR_SCHEDULED_AT,
+    ATTR_SCHEDULED_TARGET_TEMP,
+    ATTR_THERMAL_MODEL,
+    CONF_CHANGEOVER_LOCKOUT,
     CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_DECISION_BUDGET,
     CONF_FAN_ENTITY_ID,
     CONF_COOLING_SWITCHES,
     CONF_HEATING_SWITCHES,
+    CONF_HEAT_COOL_DEADBAND,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_TARGET_TEMP,
     CONF_TEMP_STEP,
+    DEFAULT_CHANGEOVER_LOCKOUT,
+    DEFAULT_DECISION_BUDGET,
+    DEFAULT_HEAT_COOL_DEADBAND,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DEFAULT_TARGET_TEMP,
@@ -46,10 +69,17 @@ from .const import (
     FAN_LOW,
     FAN_OFF,
     FAN_MED,
+    MAX_PRESTART_DURATION,
+    MODEL_BAND_IDLE,
+    MODEL_MIN_RATE,
+    PRESTART_EVAL_INTERVAL,
+    SERVICE_CLEAR_SCHEDULED_TARGET,
+    SERVICE_SCHEDULE_TARGET_TEMPERATURE,
     THRESHOLD_HIGH,
     THRESHOLD_LOW,
     THRESHOLD_MEDIUM,
 )
+from .thermal_model import ThermalModel
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,10 +105,28 @@ async def async_setup_entry(
                 data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP),
                 data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
                 data.get(CONF_TEMP_STEP, DEFAULT_TEMP_STEP),
+                data.get(CONF_HEAT_COOL_DEADBAND, DEFAULT_HEAT_COOL_DEADBAND),
+                data.get(CONF_CHANGEOVER_LOCKOUT, DEFAULT_CHANGEOVER_LOCKOUT),
+                data.get(CONF_DECISION_BUDGET, DEFAULT_DECISION_BUDGET),
             )
         ]
     )
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SCHEDULE_TARGET_TEMPERATURE,
+        {
+            vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Required("at"): cv.datetime,
+        },
+        "async_schedule_target_temperature",
+    )
+    platform.async_register_entity_service(
+        SERVICE_CLEAR_SCHEDULED_TARGET,
+        {},
+        "async_clear_scheduled_target",
+    )
+
 
 class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
     """Representation of a Generic Fan Coil Thermostat."""
@@ -93,6 +141,8 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
     )
     _enable_turn_on_off_backwards_compatibility = False
     _attr_fan_modes = ["off", "low", "medium", "high", "auto"]
+    # Changes on every model update; restore state still keeps it
+    _unrecorded_attributes = frozenset({ATTR_THERMAL_MODEL})
 
     def __init__(
         self,
@@ -106,6 +156,9 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         max_temp,
         target_temp,
         temp_step,
+        heat_cool_deadband,
+        changeover_lockout,
+        decision_budget,
     ):
         """Initialize the thermostat."""
         self.hass = hass
@@ -124,22 +177,64 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         # If no switches configured, still allow both modes (fan-only operation)
         if not self._cooling_switches and not self._heating_switches:
             hvac_modes.extend([HVACMode.HEAT, HVACMode.COOL])
+        # Units with both circuits can pick heating or cooling on their own
+        if self._cooling_switches and self._heating_switches:
+            hvac_modes.append(HVACMode.HEAT_COOL)
+            self._attr_supported_features |= ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
         self._attr_hvac_modes = hvac_modes
         
-        _LOGGER.debug(f"Initializing thermostat with cooling switches: {self._cooling_switches}")
-        _LOGGER.debug(f"Initializing thermostat with heating switches: {self._heating_switches}")
-        _LOGGER.debug(f"Available HVAC modes: {hvac_modes}")
-        
+        _LOGGER.debug("Initializing thermostat with cooling switches: %s", self._cooling_switches)
+        _LOGGER.debug("Initializing thermostat with heating switches: %s", self._heating_switches)
+        _LOGGER.debug("Available HVAC modes: %s", hvac_modes)
+
+        # Service call payloads are built once instead of on every control pass
+        self._fan_payload = {"entity_id": fan_entity_id}
+        self._fan_preset_payloads = {
+            mode: {"entity_id": fan_entity_id, "preset_mode": mode}
+            for mode in (FAN_LOW, FAN_MED, FAN_HIGH)
+        }
+        # Per switch group: the group call payload and the per-switch fallbacks
+        self._switch_payloads = {
+            group: (
+                {"entity_id": switches} if switches else None,
+                [{"entity_id": switch_entity} for switch_entity in switches],
+            )
+            for group, switches in (
+                ("cooling", self._cooling_switches),
+                ("heating", self._heating_switches),
+            )
+        }
+        # Opt-in profiling: warn about control passes over this many nanoseconds
+        self._decision_budget_ns = (decision_budget or 0) * 1000
+        self._over_decision_budget = False
+
         self._attr_min_temp = min_temp
         self._attr_max_temp = max_temp
         self._attr_target_temperature = target_temp
         self._attr_target_temperature_step = temp_step
+        self._attr_target_temperature_low = target_temp - heat_cool_deadband / 2
+        self._attr_target_temperature_high = target_temp + heat_cool_deadband / 2
+        self._heat_cool_deadband = heat_cool_deadband
+        self._changeover_lockout = timedelta(minutes=changeover_lockout)
+        # Side currently selected in HEAT_COOL mode and when it was selected
+        self._heat_cool_side = None
+        self._last_changeover = None
         self._attr_hvac_mode = HVACMode.OFF
         self._attr_current_temperature = None
         self._attr_fan_mode = "auto"
         self._attr_hvac_action = HVACAction.OFF
         self._current_fan_mode = FAN_OFF
 
+        # Learned heating/cooling rates and the next scheduled setpoint
+        self._thermal_model = ThermalModel()
+        self._model_band = None
+        self._scheduled_target_temp = None
+        self._scheduled_at = None
+        self._unsub_scheduled_target = None
+        self._unsub_prestart_interval = None
+        # When the current early start began; it runs until the schedule applies
+        self._prestart_started = None
+
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
@@ -148,10 +243,32 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         last_state = await self.async_get_last_state()
         if last_state is not None:
             self._attr_hvac_mode = last_state.state
-            if last_state.attributes.get(ATTR_TEMPERATURE) is not None:
-                self._attr_target_temperature = last_state.attributes.get(ATTR_TEMPERATURE)
+            # The saved setpoints are kept whichever mode was active; fall back
+            # to the standard attributes for states written before they existed
+            for attr, fallback_attr, name in (
+                (ATTR_SAVED_TEMPERATURE, ATTR_TEMPERATURE, "_attr_target_temperature"),
+                (ATTR_SAVED_TARGET_TEMP_LOW, ATTR_TARGET_TEMP_LOW, "_attr_target_temperature_low"),
+                (ATTR_SAVED_TARGET_TEMP_HIGH, ATTR_TARGET_TEMP_HIGH, "_attr_target_temperature_high"),
+            ):
+                value = last_state.attributes.get(attr)
+                if value is None:
+                    value = last_state.attributes.get(fallback_attr)
+                if value is not None:
+                    setattr(self, name, value)
+            if last_state.state == HVACMode.HEAT_COOL and last_state.attributes.get(ATTR_HEAT_COOL_SIDE) in (
+                HVACMode.HEAT,
+                HVACMode.COOL,
+            ):
+                self._heat_cool_side = HVACMode(last_state.attributes.get(ATTR_HEAT_COOL_SIDE))
+            if last_state.attributes.get(ATTR_LAST_CHANGEOVER) is not None:
+                self._last_changeover = dt_util.parse_datetime(
+                    str(last_state.attributes.get(ATTR_LAST_CHANGEOVER))
+                )
             if last_state.attributes.get("fan_mode") is not None:
                 self._attr_fan_mode = last_state.attributes.get("fan_mode")
+            self._thermal_model.restore(last_state.attributes.get(ATTR_THERMAL_MODEL))
+
+        self.async_on_remove(self._async_cancel_schedule_listeners)
 
         # Add listeners
         self.async_on_remove(
@@ -174,9 +291,64 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         ):
             self._attr_current_temperature = float(current_temp_state.state)
 
+        # Resume a scheduled setpoint, or apply it if it fell due while stopped.
+        # HEAT_COOL does not use schedules, see async_set_hvac_mode.
+        if last_state is not None and self._attr_hvac_mode != HVACMode.HEAT_COOL:
+            scheduled_temp = last_state.attributes.get(ATTR_SCHEDULED_TARGET_TEMP)
+            scheduled_at = last_state.attributes.get(ATTR_SCHEDULED_AT)
+            if scheduled_temp is not None and scheduled_at is not None:
+                scheduled_at = dt_util.parse_datetime(str(scheduled_at))
+                if scheduled_at is None:
+                    _LOGGER.warning("Ignoring scheduled target with invalid time: %s", last_state.attributes.get(ATTR_SCHEDULED_AT))
+                elif scheduled_at > dt_util.utcnow():
+                    self._async_set_schedule(float(scheduled_temp), scheduled_at)
+                else:
+                    self._attr_target_temperature = float(scheduled_temp)
+
         # Run control logic on startup
         self.async_control_fan()
 
+    @property
+    def target_temperature(self) -> Optional[float]:
+        """Return the single setpoint, which does not apply in HEAT_COOL mode."""
+        if self._attr_hvac_mode == HVACMode.HEAT_COOL:
+            return None
+        return self._attr_target_temperature
+
+    @property
+    def target_temperature_low(self) -> Optional[float]:
+        """Return the heating setpoint used in HEAT_COOL mode."""
+        if self._attr_hvac_mode != HVACMode.HEAT_COOL:
+            return None
+        return self._attr_target_temperature_low
+
+    @property
+    def target_temperature_high(self) -> Optional[float]:
+        """Return the cooling setpoint used in HEAT_COOL mode."""
+        if self._attr_hvac_mode != HVACMode.HEAT_COOL:
+            return None
+        return self._attr_target_temperature_high
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the saved setpoints, heat/cool state, thermal model and schedule."""
+        prestart_at = self._prestart_time()
+        return {
+            ATTR_SAVED_TEMPERATURE: self._attr_target_temperature,
+            ATTR_SAVED_TARGET_TEMP_LOW: self._attr_target_temperature_low,
+            ATTR_SAVED_TARGET_TEMP_HIGH: self._attr_target_temperature_high,
+            ATTR_HEAT_COOL_SIDE: self._heat_cool_side,
+            ATTR_LAST_CHANGEOVER: (
+                self._last_changeover.isoformat() if self._last_changeover else None
+            ),
+            ATTR_THERMAL_MODEL: self._thermal_model.as_dict(),
+            ATTR_SCHEDULED_TARGET_TEMP: self._scheduled_target_temp,
+            ATTR_SCHEDULED_AT: (
+                self._scheduled_at.isoformat() if self._scheduled_at else None
+            ),
+            ATTR_PRESTART_AT: prestart_at.isoformat() if prestart_at else None,
+        }
+
     @callback
     def _async_temp_changed(self, event):
         """Handle temperature changes."""
@@ -186,6 +358,11 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
 
         try:
             self._attr_current_temperature = float(new_state.state)
+            self._thermal_model.observe(
+                self._model_key(),
+                new_state.last_updated.timestamp(),
+                self._attr_current_temperature,
+            )
             self.async_control_fan()
             self.async_write_ha_state()
         except ValueError as ex:
@@ -206,10 +383,26 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
             preset_mode = new_state.attributes.get("preset_mode", FAN_LOW)
             self._current_fan_mode = preset_mode
 
+        self._async_track_model_band()
         self.async_write_ha_state()
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
+        if ATTR_HVAC_MODE in kwargs:
+            await self.async_set_hvac_mode(kwargs[ATTR_HVAC_MODE])
+
+        if ATTR_TARGET_TEMP_LOW in kwargs or ATTR_TARGET_TEMP_HIGH in kwargs:
+            target_low = kwargs.get(ATTR_TARGET_TEMP_LOW, self._attr_target_temperature_low)
+            target_high = kwargs.get(ATTR_TARGET_TEMP_HIGH, self._attr_target_temperature_high)
+            if target_high - target_low < self._heat_cool_deadband:
+                raise ValueError(
+                    f"Target temperature range {target_low}-{target_high} is narrower than the deadband of {self._heat_cool_deadband}"
+                )
+            self._attr_target_temperature_low = target_low
+            self._attr_target_temperature_high = target_high
+            self.async_control_fan()
+            self.async_write_ha_state()
+
         if ATTR_TEMPERATURE in kwargs:
             self._attr_target_temperature = kwargs[ATTR_TEMPERATURE]
             self.async_control_fan()
@@ -236,18 +429,45 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         if hvac_mode not in self.hvac_modes:
             raise ValueError(f"Invalid hvac mode: {hvac_mode}")
             
+        previous_mode = self._attr_hvac_mode
         self._attr_hvac_mode = hvac_mode
-        
+        self._prestart_started = None
+
+        # Keep the lockout timestamp, but only HEAT_COOL has a selected side.
+        # Entering it continues on the side the previous mode was using.
+        if hvac_mode != HVACMode.HEAT_COOL:
+            self._heat_cool_side = None
+        elif previous_mode != HVACMode.HEAT_COOL:
+            self._heat_cool_side = (
+                previous_mode if previous_mode in (HVACMode.HEAT, HVACMode.COOL) else None
+            )
+            # The single setpoint it would change is not used in HEAT_COOL
+            if self._scheduled_at is not None:
+                _LOGGER.warning(
+                    "Dropping scheduled target temperature %s°C at %s, heat_cool mode does not use it",
+                    self._scheduled_target_temp,
+                    self._scheduled_at,
+                )
+                self._async_cancel_schedule_listeners()
+                self._scheduled_target_temp = None
+                self._scheduled_at = None
+
         if hvac_mode == HVACMode.OFF:
             # Turn off all switches but only turn off fan if it's in auto mode
             await self.async_turn_off_cooling_switches()
             await self.async_turn_off_heating_switches()
             if self._attr_fan_mode == "auto":
                 await self.hass.services.async_call(
-                    "fan", "turn_off", {"entity_id": self._fan_entity_id}
+                    "fan", "turn_off", self._fan_payload
                 )
             self._attr_hvac_action = HVACAction.OFF
+            self._async_track_model_band()
         else:
+            # Never leave the circuit the new mode does not use running
+            if hvac_mode == HVACMode.HEAT:
+                await self.async_turn_off_cooling_switches()
+            elif hvac_mode == HVACMode.COOL:
+                await self.async_turn_off_heating_switches()
             # Run control logic
             self.async_control_fan()
         
@@ -255,218 +475,433 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
 
     def async_control_fan(self):
         """Control the fan based on temperature difference."""
-        if self._attr_hvac_mode == HVACMode.OFF:
-            _LOGGER.debug("HVAC mode is OFF, skipping fan control")
+        if not self._decision_budget_ns:
+            self._async_control_pass()
+            self._async_track_model_band()
             return
-            
-        if self._attr_current_temperature is None or self._attr_target_temperature is None:
-            _LOGGER.debug("Temperature values not available, skipping fan control")
+
+        start = time.perf_counter_ns()
+        self._async_control_pass()
+        elapsed = time.perf_counter_ns() - start
+        # Only log when crossing the budget so a tight budget cannot flood the log
+        over_budget = elapsed > self._decision_budget_ns
+        if over_budget != self._over_decision_budget:
+            self._over_decision_budget = over_budget
+            if over_budget:
+                _LOGGER.warning(
+                    "Control pass for %s took %d µs, over the %d µs budget",
+                    self.entity_id,
+                    elapsed // 1000,
+                    self._decision_budget_ns // 1000,
+                )
+            else:
+                _LOGGER.info(
+                    "Control pass for %s took %d µs, back within the %d µs budget",
+                    self.entity_id,
+                    elapsed // 1000,
+                    self._decision_budget_ns // 1000,
+                )
+        self._async_track_model_band()
+
+    def _async_control_pass(self):
+        """Decide the fan speed and switch states and apply them in one task."""
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        # Entity attribute access is comparatively slow, read each value once
+        hvac_mode = self._attr_hvac_mode
+
+        if hvac_mode == HVACMode.OFF:
+            if debug:
+                _LOGGER.debug("HVAC mode is OFF, skipping fan control")
+            return
+
+        current_temp = self._attr_current_temperature
+        target_temp = self._attr_target_temperature
+        if current_temp is None or target_temp is None:
+            if debug:
+                _LOGGER.debug("Temperature values not available, skipping fan control")
             return
 
         # Calculate temperature difference
-        temp_diff = self._attr_current_temperature - self._attr_target_temperature
-        _LOGGER.debug(f"Temperature difference: {temp_diff}°C (current: {self._attr_current_temperature}°C, target: {self._attr_target_temperature}°C)")
+        temp_diff = current_temp - target_temp
+        if debug:
+            _LOGGER.debug(
+                "Temperature difference: %s°C (current: %s°C, target: %s°C)",
+                temp_diff,
+                current_temp,
+                target_temp,
+            )
 
-        if self._attr_hvac_mode == HVACMode.COOL:
-            self._control_cooling(temp_diff)
-        elif self._attr_hvac_mode == HVACMode.HEAT:
-            self._control_heating(temp_diff)
-
-    def _control_cooling(self, temp_diff):
-        """Control cooling based on temperature difference."""
-        # Determine the desired fan state based on temperature difference
-        if temp_diff < THRESHOLD_LOW:
-            # Temperature below threshold, turn off cooling switches and fan (if auto)
-            _LOGGER.debug(f"Temperature difference {temp_diff}°C < {THRESHOLD_LOW}°C, turning off cooling")
-            self._attr_hvac_action = HVACAction.IDLE
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_OFF))
-            self.hass.async_create_task(self.async_turn_off_cooling_switches())
-        elif temp_diff < THRESHOLD_MEDIUM:
-            # Small difference, use low speed and turn on cooling switches
-            _LOGGER.debug(f"Temperature difference {temp_diff}°C, using LOW fan speed for cooling")
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_LOW))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
-        elif temp_diff < THRESHOLD_HIGH:
-            # Medium difference, use medium speed and turn on cooling switches
-            _LOGGER.debug(f"Temperature difference {temp_diff}°C, using MEDIUM fan speed for cooling")
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_MED))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
+        prestart_mode = None
+        if self._scheduled_at is not None:
+            prestart_mode = self._prestart_mode()
+
+        if prestart_mode is not None:
+            fan_mode, switch_calls = self._control_prestart(prestart_mode, debug)
+        elif hvac_mode == HVACMode.COOL:
+            fan_mode, switch_calls = self._control_cooling(temp_diff, debug)
+        elif hvac_mode == HVACMode.HEAT:
+            fan_mode, switch_calls = self._control_heating(temp_diff, debug)
+        elif hvac_mode == HVACMode.HEAT_COOL:
+            fan_mode, switch_calls = self._control_heat_cool(current_temp, debug)
         else:
-            # Large difference, use high speed and turn on cooling switches
-            _LOGGER.debug(f"Temperature difference {temp_diff}°C, using HIGH fan speed for cooling")
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_HIGH))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
+            return
+
+        # Only drive the fan ourselves in automatic mode
+        if self._attr_fan_mode != "auto":
+            fan_mode = None
+        self.hass.async_create_task(self._async_apply_control(fan_mode, switch_calls))
+
+    def _control_heat_cool(self, current_temp, debug=False):
+        """Pick heating or cooling from the setpoint range and control it."""
+        side = self._heat_cool_side
+        changeover_calls = ()
+
+        if current_temp - self._attr_target_temperature_high >= THRESHOLD_LOW:
+            wanted_side = HVACMode.COOL
+        elif self._attr_target_temperature_low - current_temp >= THRESHOLD_LOW:
+            wanted_side = HVACMode.HEAT
+        else:
+            wanted_side = side
+
+        if wanted_side != side:
+            now = dt_util.utcnow()
+            if (
+                side is not None
+                and self._last_changeover is not None
+                and now - self._last_changeover < self._changeover_lockout
+            ):
+                if debug:
+                    _LOGGER.debug(
+                        "Changeover to %s locked out until %s",
+                        wanted_side,
+                        self._last_changeover + self._changeover_lockout,
+                    )
+            else:
+                if debug:
+                    _LOGGER.debug("Changing over from %s to %s", side, wanted_side)
+                if side == HVACMode.COOL:
+                    changeover_calls = (("turn_off", "cooling"),)
+                elif side == HVACMode.HEAT:
+                    changeover_calls = (("turn_off", "heating"),)
+                side = self._heat_cool_side = wanted_side
+                self._last_changeover = now
+
+        if side == HVACMode.COOL:
+            fan_mode, switch_calls = self._control_cooling(
+                current_temp - self._attr_target_temperature_high, debug
+            )
+        else:
+            # Also covers the start when neither side has been needed yet
+            fan_mode, switch_calls = self._control_heating(
+                current_temp - self._attr_target_temperature_low, debug
+            )
+        return fan_mode, changeover_calls + switch_calls
+
+    @staticmethod
+    def _fan_speed_for(demand):
+        """Return the fan speed for a positive heating or cooling demand in °C."""
+        if demand < THRESHOLD_LOW:
+            return FAN_OFF
+        if demand < THRESHOLD_MEDIUM:
+            return FAN_LOW
+        if demand < THRESHOLD_HIGH:
+            return FAN_MED
+        return FAN_HIGH
+
+    def _control_cooling(self, temp_diff, debug=False):
+        """Return the fan speed and switch calls for cooling."""
+        fan_mode = self._fan_speed_for(temp_diff)
+        if fan_mode == FAN_OFF:
+            if debug:
+                _LOGGER.debug("Temperature difference %s°C < %s°C, turning off cooling", temp_diff, THRESHOLD_LOW)
+            self._attr_hvac_action = HVACAction.IDLE
+            return fan_mode, (("turn_off", "cooling"),)
 
-    def _control_heating(self, temp_diff):
-        """Control heating based on temperature difference."""
+        if debug:
+            _LOGGER.debug("Temperature difference %s°C, using %s fan speed for cooling", temp_diff, fan_mode)
+        self._attr_hvac_action = HVACAction.COOLING
+        return fan_mode, (("turn_on", "cooling"),)
+
+    def _control_heating(self, temp_diff, debug=False):
+        """Return the fan speed and switch calls for heating."""
         # For heating, we need negative temperature difference (current < target)
         heating_diff = -temp_diff  # Convert to positive value for heating need
-        
-        if heating_diff < THRESHOLD_LOW:
-            # Temperature above threshold, turn off heating switches and fan (if auto)
-            _LOGGER.debug(f"Heating difference {heating_diff}°C < {THRESHOLD_LOW}°C, turning off heating")
+
+        fan_mode = self._fan_speed_for(heating_diff)
+        if fan_mode == FAN_OFF:
+            if debug:
+                _LOGGER.debug("Heating difference %s°C < %s°C, turning off heating", heating_diff, THRESHOLD_LOW)
             self._attr_hvac_action = HVACAction.IDLE
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_OFF))
-            self.hass.async_create_task(self.async_turn_off_heating_switches())
-        elif heating_diff < THRESHOLD_MEDIUM:
-            # Small difference, use low speed and turn on heating switches
-            _LOGGER.debug(f"Heating difference {heating_diff}°C, using LOW fan speed for heating")
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_LOW))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
-        elif heating_diff < THRESHOLD_HIGH:
-            # Medium difference, use medium speed and turn on heating switches
-            _LOGGER.debug(f"Heating difference {heating_diff}°C, using MEDIUM fan speed for heating")
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_MED))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
+            return fan_mode, (("turn_off", "heating"),)
+
+        if debug:
+            _LOGGER.debug("Heating difference %s°C, using %s fan speed for heating", heating_diff, fan_mode)
+        self._attr_hvac_action = HVACAction.HEATING
+        return fan_mode, (("turn_on", "heating"),)
+
+    def _control_prestart(self, hvac_mode, debug=False):
+        """Return the low speed run ahead of a scheduled setpoint change."""
+        if debug:
+            _LOGGER.debug(
+                "Starting early at LOW fan speed for scheduled target %s°C at %s",
+                self._scheduled_target_temp,
+                self._scheduled_at,
+            )
+        if hvac_mode == HVACMode.COOL:
+            self._attr_hvac_action = HVACAction.COOLING
+            return FAN_LOW, (("turn_on", "cooling"),)
+        self._attr_hvac_action = HVACAction.HEATING
+        return FAN_LOW, (("turn_on", "heating"),)
+
+    async def _async_apply_control(self, fan_mode, switch_calls):
+        """Apply the outcome of a control pass."""
+        if fan_mode is not None:
+            # A failing fan must not keep the switches, e.g. a changeover, from running
+            try:
+                await self.async_update_fan(fan_mode)
+            except Exception as ex:
+                _LOGGER.error("Error setting fan %s to %s: %s", self._fan_entity_id, fan_mode, ex)
+        for service, group in switch_calls:
+            await self._async_call_switches(service, group)
+
+    def _model_key(self):
+        """Return the thermal model band for the current operating state."""
+        fan_mode = self._current_fan_mode
+        hvac_action = self._attr_hvac_action
+        if fan_mode in (FAN_LOW, FAN_MED, FAN_HIGH):
+            if hvac_action == HVACAction.HEATING:
+                return f"heating_{fan_mode}"
+            if hvac_action == HVACAction.COOLING:
+                return f"cooling_{fan_mode}"
+        elif fan_mode == FAN_OFF and hvac_action in (HVACAction.IDLE, HVACAction.OFF):
+            return MODEL_BAND_IDLE
+        # Manual fan speed without heating or cooling, nothing to learn from
+        return None
+
+    @callback
+    def _async_track_model_band(self):
+        """Tell the thermal model when the operating band changes."""
+        key = self._model_key()
+        if key != self._model_band:
+            self._model_band = key
+            self._thermal_model.band_changed(key, dt_util.utcnow().timestamp())
+
+    def _scheduled_demand(self):
+        """Return how far the room is from the scheduled setpoint, in the mode's direction."""
+        if (
+            self._scheduled_at is None
+            or self._attr_current_temperature is None
+            or self._attr_hvac_mode not in (HVACMode.HEAT, HVACMode.COOL)
+        ):
+            return None
+
+        delta = self._scheduled_target_temp - self._attr_current_temperature
+        if self._attr_hvac_mode == HVACMode.COOL:
+            return -delta
+        return delta
+
+    def _prestart_time(self):
+        """Return when the unit should start for the scheduled setpoint, if known."""
+        if self._prestart_started is not None:
+            return self._prestart_started
+
+        demand = self._scheduled_demand()
+        if demand is None:
+            return None
+
+        if self._attr_hvac_mode == HVACMode.HEAT:
+            rate = self._thermal_model.rate(f"heating_{FAN_LOW}")
         else:
-            # Large difference, use high speed and turn on heating switches
-            _LOGGER.debug(f"Heating difference {heating_diff}°C, using HIGH fan speed for heating")
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_HIGH))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
+            rate = self._thermal_model.rate(f"cooling_{FAN_LOW}")
+            rate = -rate if rate is not None else None
+
+        # Nothing to do, or the low speed rate has not been learned yet
+        if demand < THRESHOLD_LOW or rate is None or rate < MODEL_MIN_RATE:
+            return None
+
+        lead_time = min(demand / rate * 3600, MAX_PRESTART_DURATION)
+        return self._scheduled_at - timedelta(seconds=lead_time)
+
+    def _prestart_mode(self):
+        """Return the HVAC mode to start early in, or None if not needed now."""
+        if self._prestart_started is not None:
+            # Once started, keep going until the schedule applies or the
+            # scheduled setpoint is reached, so a fast warm-up does not cycle
+            demand = self._scheduled_demand()
+            if demand is None or demand < THRESHOLD_LOW:
+                self._prestart_started = None
+                return None
+        else:
+            prestart_at = self._prestart_time()
+            now = dt_util.utcnow()
+            if prestart_at is None or now < prestart_at:
+                return None
+            self._prestart_started = now
+
+        # Only take over while the current setpoint itself asks for nothing
+        temp_diff = self._attr_current_temperature - self._attr_target_temperature
+        if self._attr_hvac_mode == HVACMode.COOL and temp_diff < THRESHOLD_LOW:
+            return HVACMode.COOL
+        if self._attr_hvac_mode == HVACMode.HEAT and -temp_diff < THRESHOLD_LOW:
+            return HVACMode.HEAT
+        return None
+
+    async def async_schedule_target_temperature(self, temperature, at):
+        """Schedule a target temperature change, starting early if needed."""
+        if self._attr_hvac_mode == HVACMode.HEAT_COOL:
+            raise ValueError(
+                "A scheduled target temperature is not supported in heat_cool mode, which uses a low/high range"
+            )
+        if not self.min_temp <= temperature <= self.max_temp:
+            raise ValueError(
+                f"Scheduled temperature {temperature} is outside {self.min_temp}-{self.max_temp}"
+            )
+
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        at = dt_util.as_utc(at)
+
+        if at <= dt_util.utcnow():
+            self._async_cancel_schedule_listeners()
+            self._scheduled_target_temp = None
+            self._scheduled_at = None
+            self._prestart_started = None
+            self._attr_target_temperature = temperature
+        else:
+            self._async_set_schedule(temperature, at)
+
+        self.async_control_fan()
+        self.async_write_ha_state()
+
+    async def async_clear_scheduled_target(self):
+        """Drop the scheduled target temperature."""
+        self._async_cancel_schedule_listeners()
+        self._scheduled_target_temp = None
+        self._scheduled_at = None
+        self._prestart_started = None
+        self.async_control_fan()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_set_schedule(self, temperature, at):
+        """Store a scheduled setpoint and track its start and switch-over."""
+        self._async_cancel_schedule_listeners()
+        self._scheduled_target_temp = temperature
+        self._scheduled_at = at
+        self._prestart_started = None
+        self._unsub_scheduled_target = async_track_point_in_utc_time(
+            self.hass, self._async_scheduled_target_reached, at
+        )
+        self._unsub_prestart_interval = async_track_time_interval(
+            self.hass,
+            self._async_prestart_tick,
+            timedelta(seconds=PRESTART_EVAL_INTERVAL),
+        )
+
+    @callback
+    def _async_cancel_schedule_listeners(self):
+        """Cancel the timers tracking a scheduled setpoint."""
+        if self._unsub_scheduled_target is not None:
+            self._unsub_scheduled_target()
+            self._unsub_scheduled_target = None
+        if self._unsub_prestart_interval is not None:
+            self._unsub_prestart_interval()
+            self._unsub_prestart_interval = None
+
+    @callback
+    def _async_scheduled_target_reached(self, now):
+        """Apply the scheduled setpoint."""
+        self._unsub_scheduled_target = None
+        if self._unsub_prestart_interval is not None:
+            self._unsub_prestart_interval()
+            self._unsub_prestart_interval = None
+
+        self._attr_target_temperature = self._scheduled_target_temp
+        self._scheduled_target_temp = None
+        self._scheduled_at = None
+        self._prestart_started = None
+        self.async_control_fan()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_prestart_tick(self, now):
+        """Start the control pass that begins pre-start once it falls due."""
+        # A running pre-start is kept up by temperature updates; until one is
+        # due there is nothing to change, so avoid resending service calls
+        if self._prestart_started is not None:
+            return
+        prestart_at = self._prestart_time()
+        if prestart_at is None or now < prestart_at:
+            return
+        self.async_control_fan()
+        self.async_write_ha_state()
 
     async def async_update_fan(self, mode):
         """Update the fan state."""
+        services = self.hass.services
         if mode == FAN_OFF:
-            await self.hass.services.async_call(
-                "fan", "turn_off", {"entity_id": self._fan_entity_id}
+            await services.async_call(
+                "fan", "turn_off", self._fan_payload
             )
         else:
             # Turn on fan and set its mode
-            await self.hass.services.async_call(
-                "fan", "turn_on", {"entity_id": self._fan_entity_id}
+            await services.async_call(
+                "fan", "turn_on", self._fan_payload
             )
-            
-            await self.hass.services.async_call(
-                "fan", 
-                "set_preset_mode", 
-                {
-                    "entity_id": self._fan_entity_id,
-                    "preset_mode": mode
-                }
+
+            await services.async_call(
+                "fan",
+                "set_preset_mode",
+                self._fan_preset_payloads[mode],
             )
 
     async def async_turn_on_cooling_switches(self):
         """Turn on all cooling switches."""
-        if not self._cooling_switches:
-            _LOGGER.debug("No cooling switches configured")
-            return
-            
-        _LOGGER.debug(f"Turning ON cooling switches: {self._cooling_switches}")
-        
-        # Turn on all switches in a single service call if possible
-        try:
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_on", 
-                {"entity_id": self._cooling_switches}
-            )
-            _LOGGER.debug("Successfully turned ON all cooling switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning on cooling switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._cooling_switches:
-                try:
-                    _LOGGER.debug(f"Turning ON switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_on", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(f"Error turning on switch {switch_entity}: {switch_ex}")
+        await self._async_call_switches("turn_on", "cooling")
 
     async def async_turn_off_cooling_switches(self):
         """Turn off all cooling switches."""
-        if not self._cooling_switches:
-            _LOGGER.debug("No cooling switches configured")
-            return
-            
-        _LOGGER.debug(f"Turning OFF cooling switches: {self._cooling_switches}")
-        
-        # Turn off all switches in a single service call if possible
-        try:
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_off", 
-                {"entity_id": self._cooling_switches}
-            )
-            _LOGGER.debug("Successfully turned OFF all cooling switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning off cooling switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._cooling_switches:
-                try:
-                    _LOGGER.debug(f"Turning OFF switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_off", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(f"Error turning off switch {switch_entity}: {switch_ex}")
+        await self._async_call_switches("turn_off", "cooling")
 
     async def async_turn_on_heating_switches(self):
         """Turn on all heating switches."""
-        if not self._heating_switches:
-            _LOGGER.debug("No heating switches configured")
-            return
-            
-        _LOGGER.debug(f"Turning ON heating switches: {self._heating_switches}")
-        
-        # Turn on all switches in a single service call if possible
-        try:
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_on", 
-                {"entity_id": self._heating_switches}
-            )
-            _LOGGER.debug("Successfully turned ON all heating switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning on heating switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._heating_switches:
-                try:
-                    _LOGGER.debug(f"Turning ON heating switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_on", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(f"Error turning on heating switch {switch_entity}: {switch_ex}")
+        await self._async_call_switches("turn_on", "heating")
 
     async def async_turn_off_heating_switches(self):
         """Turn off all heating switches."""
-        if not self._heating_switches:
-            _LOGGER.debug("No heating switches configured")
+        await self._async_call_switches("turn_off", "heating")
+
+    async def _async_call_switches(self, service, group):
+        """Call a switch service for a whole switch group."""
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        group_payload, switch_payloads = self._switch_payloads[group]
+        if group_payload is None:
+            if debug:
+                _LOGGER.debug("No %s switches configured", group)
             return
-            
-        _LOGGER.debug(f"Turning OFF heating switches: {self._heating_switches}")
-        
-        # Turn off all switches in a single service call if possible
+
+        if debug:
+            _LOGGER.debug("Calling switch.%s for %s switches: %s", service, group, group_payload["entity_id"])
+
+        # Call all switches in a single service call if possible
         try:
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_off", 
-                {"entity_id": self._heating_switches}
-            )
-            _LOGGER.debug("Successfully turned OFF all heating switches")
+            services = self.hass.services
+            await services.async_call("switch", service, group_payload)
+            if debug:
+                _LOGGER.debug("Successfully called switch.%s for all %s switches", service, group)
         except Exception as ex:
-            _LOGGER.error(f"Error turning off heating switches: {ex}")
+            _LOGGER.error("Error calling switch.%s for %s switches: %s", service, group, ex)
             # Fallback to individual calls
-            for switch_entity in self._heating_switches:
+            for switch_payload in switch_payloads:
                 try:
-                    _LOGGER.debug(f"Turning OFF heating switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_off", {"entity_id": switch_entity}
-                    )
+                    if debug:
+                        _LOGGER.debug("Calling switch.%s individually: %s", service, switch_payload["entity_id"])
+                    await services.async_call("switch", service, switch_payload)
                 except Exception as switch_ex:
-                    _LOGGER.error(f"Error turning off heating switch {switch_entity}: {switch_ex}")
+                    _LOGGER.error(
+                        "Error calling switch.%s for %s switch %s: %s",
+                        service,
+                        group,
+                        switch_payload["entity_id"],
+                        switch_ex,
+                    )
@@ -17,10 +17,16 @@ from .const import (
     CONF_MAX_TEMP,
     CONF_TARGET_TEMP,
     CONF_TEMP_STEP,
+    CONF_HEAT_COOL_DEADBAND,
+    CONF_CHANGEOVER_LOCKOUT,
+    CONF_DECISION_BUDGET,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
     DEFAULT_TARGET_TEMP,
     DEFAULT_TEMP_STEP,
+    DEFAULT_HEAT_COOL_DEADBAND,
+    DEFAULT_CHANGEOVER_LOCKOUT,
+    DEFAULT_DECISION_BUDGET,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -85,6 +91,9 @@ class GenericFanCoilConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Optional(CONF_MAX_TEMP, default=DEFAULT_MAX_TEMP): vol.Coerce(float),
                     vol.Optional(CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP): vol.Coerce(float),
                     vol.Optional(CONF_TEMP_STEP, default=DEFAULT_TEMP_STEP): vol.Coerce(float),
+                    vol.Optional(CONF_HEAT_COOL_DEADBAND, default=DEFAULT_HEAT_COOL_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(CONF_CHANGEOVER_LOCKOUT, default=DEFAULT_CHANGEOVER_LOCKOUT): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(CONF_DECISION_BUDGET, default=DEFAULT_DECISION_BUDGET): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 }
             ),
             errors=errors,
@@ -154,6 +163,24 @@ class GenericFanCoilOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_TEMP_STEP, self.config_entry.data.get(CONF_TEMP_STEP, DEFAULT_TEMP_STEP)
                 ),
             ): vol.Coerce(float),
+            vol.Optional(
+                CONF_HEAT_COOL_DEADBAND,
+                default=self.config_entry.options.get(
+                    CONF_HEAT_COOL_DEADBAND, self.config_entry.data.get(CONF_HEAT_COOL_DEADBAND, DEFAULT_HEAT_COOL_DEADBAND)
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_CHANGEOVER_LOCKOUT,
+                default=self.config_entry.options.get(
+                    CONF_CHANGEOVER_LOCKOUT, self.config_entry.data.get(CONF_CHANGEOVER_LOCKOUT, DEFAULT_CHANGEOVER_LOCKOUT)
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DECISION_BUDGET,
+                default=self.config_entry.options.get(
+                    CONF_DECISION_BUDGET, self.config_entry.data.get(CONF_DECISION_BUDGET, DEFAULT_DECISION_BUDGET)
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
         }
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
@@ -12,12 +12,18 @@ CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
 CONF_TARGET_TEMP = "target_temp"
 CONF_TEMP_STEP = "temp_step"
+CONF_HEAT_COOL_DEADBAND = "heat_cool_deadband"
+CONF_CHANGEOVER_LOCKOUT = "changeover_lockout"
+CONF_DECISION_BUDGET = "decision_budget"
 
 # Default settings
 DEFAULT_MIN_TEMP = 15.0
 DEFAULT_MAX_TEMP = 30.0
 DEFAULT_TARGET_TEMP = 22.0
 DEFAULT_TEMP_STEP = 0.5
+DEFAULT_HEAT_COOL_DEADBAND = 2.0  # Minimum gap between heat and cool setpoints
+DEFAULT_CHANGEOVER_LOCKOUT = 30  # Minutes before switching between heating and cooling again
+DEFAULT_DECISION_BUDGET = 0  # Microseconds per control pass; 0 disables the check
 
 # Fan modes
 FAN_OFF = "off"
@@ -29,3 +35,29 @@ FAN_HIGH = "high"
 THRESHOLD_LOW = 0.5  # Temperature difference for activating low speed
 THRESHOLD_MEDIUM = 1.5  # Temperature difference for activating medium speed
 THRESHOLD_HIGH = 2.5  # Temperature difference for activating high speed
+
+# Thermal model learning
+MODEL_BAND_IDLE = "idle"  # Key for the free-drift rate (switches and fan off)
+MODEL_FORGETTING_FACTOR = 0.9  # Weight kept from previous segments on each update
+MODEL_MIN_SEGMENT_SAMPLES = 3  # Samples needed before a segment slope is trusted
+MODEL_MIN_SEGMENT_DURATION = 600  # Seconds a segment must span to be learned from
+MODEL_MAX_SEGMENT_DURATION = 7200  # Seconds after which a running segment is folded in
+MODEL_MAX_SEED_AGE = 60  # Seconds a previous sample may be old to start an untracked segment
+MODEL_MIN_RATE = 0.05  # °C/h below which a learned rate is too weak to plan with
+
+# Heat/cool state kept across restarts
+ATTR_SAVED_TEMPERATURE = "saved_temperature"
+ATTR_SAVED_TARGET_TEMP_LOW = "saved_target_temp_low"
+ATTR_SAVED_TARGET_TEMP_HIGH = "saved_target_temp_high"
+ATTR_HEAT_COOL_SIDE = "heat_cool_side"
+ATTR_LAST_CHANGEOVER = "last_changeover"
+
+# Predictive start
+ATTR_THERMAL_MODEL = "thermal_model"
+ATTR_SCHEDULED_TARGET_TEMP = "scheduled_target_temperature"
+ATTR_SCHEDULED_AT = "scheduled_at"
+ATTR_PRESTART_AT = "prestart_at"
+SERVICE_SCHEDULE_TARGET_TEMPERATURE = "schedule_target_temperature"
+SERVICE_CLEAR_SCHEDULED_TARGET = "clear_scheduled_target"
+MAX_PRESTART_DURATION = 10800  # Seconds; never start earlier than this ahead of a transition
+PRESTART_EVAL_INTERVAL = 60  # Seconds between predictive start evaluations
@@ -0,0 +1,187 @@
+"""Online thermal model for the Generic Fan Coil Thermostat integration."""
+import logging
+from typing import Any, Dict, Optional
+
+from .const import (
+    MODEL_FORGETTING_FACTOR,
+    MODEL_MAX_SEED_AGE,
+    MODEL_MAX_SEGMENT_DURATION,
+    MODEL_MIN_SEGMENT_DURATION,
+    MODEL_MIN_SEGMENT_SAMPLES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Segment:
+    """Running least squares fit of temperature over time for one operating band."""
+
+    def __init__(self, key, timestamp, temperature):
+        """Start a segment at the given sample."""
+        self.key = key
+        self.start = timestamp
+        self.end = timestamp
+        self.count = 0
+        self._sum_t = 0.0
+        self._sum_y = 0.0
+        self._sum_tt = 0.0
+        self._sum_ty = 0.0
+        self.add(timestamp, temperature)
+
+    def add(self, timestamp, temperature):
+        """Add a sample; time is kept relative to the segment start in hours."""
+        t = (timestamp - self.start) / 3600.0
+        self.end = timestamp
+        self.count += 1
+        self._sum_t += t
+        self._sum_y += temperature
+        self._sum_tt += t * t
+        self._sum_ty += t * temperature
+
+    @property
+    def duration(self):
+        """Return the segment span in seconds."""
+        return self.end - self.start
+
+    def slope(self) -> Optional[float]:
+        """Return the least squares temperature slope in °C/h."""
+        denominator = self.count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (self.count * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+
+class ThermalModel:
+    """Learn per-band heating, cooling and drift rates from observed temperatures.
+
+    Every operating band (for example ``heating_low`` or ``idle``) gets a rate in
+    °C/h. While a band is active, samples are fitted with an incremental least
+    squares line; when the band changes the segment slope is folded into the band
+    rate with exponential forgetting, weighted by how long the segment lasted.
+    """
+
+    def __init__(self, forgetting_factor=MODEL_FORGETTING_FACTOR):
+        """Initialize an empty model."""
+        self._forgetting_factor = forgetting_factor
+        self._rates: Dict[str, Dict[str, float]] = {}
+        self._segment: Optional[_Segment] = None
+        self._last_sample = None
+
+    def band_changed(self, key, timestamp):
+        """Record that ``key`` became the active band at ``timestamp``.
+
+        Sensors usually only report when the value changes, so the temperature
+        is taken to still be the last reported one. Both the ending and the new
+        segment are anchored at the moment of the change.
+        """
+        segment = self._segment
+        if segment is not None and segment.key == key:
+            return
+
+        last_temperature = None
+        if self._last_sample is not None:
+            last_temperature = self._last_sample[1]
+
+        if segment is not None:
+            if last_temperature is not None and timestamp > segment.end:
+                segment.add(timestamp, last_temperature)
+            self._close_segment()
+
+        if key is not None and last_temperature is not None:
+            self._segment = _Segment(key, timestamp, last_temperature)
+
+    def observe(self, key, timestamp, temperature):
+        """Record a temperature sample taken while ``key`` was the active band.
+
+        A ``key`` of ``None`` means the unit is in a state the model does not
+        learn from (e.g. a manual fan speed without any switch active).
+        """
+        segment = self._segment
+        if segment is not None and segment.key != key:
+            self._close_segment()
+            segment = None
+
+        if key is not None:
+            if segment is None:
+                # Without a recorded band change, only a recent previous sample
+                # is a fair estimate of when this band took over
+                if (
+                    self._last_sample is not None
+                    and timestamp - self._last_sample[0] <= MODEL_MAX_SEED_AGE
+                ):
+                    self._segment = _Segment(key, *self._last_sample)
+                    self._segment.add(timestamp, temperature)
+                else:
+                    self._segment = _Segment(key, timestamp, temperature)
+            else:
+                segment.add(timestamp, temperature)
+                if segment.duration >= MODEL_MAX_SEGMENT_DURATION:
+                    self._close_segment()
+                    # The band is still active, continue from this sample
+                    self._segment = _Segment(key, timestamp, temperature)
+
+        self._last_sample = (timestamp, temperature)
+
+    def _close_segment(self):
+        """Fold the running segment into its band rate."""
+        segment = self._segment
+        self._segment = None
+        if segment is None:
+            return
+        if (
+            segment.count < MODEL_MIN_SEGMENT_SAMPLES
+            or segment.duration < MODEL_MIN_SEGMENT_DURATION
+        ):
+            return
+
+        slope = segment.slope()
+        if slope is None:
+            return
+
+        weight = segment.duration / 3600.0
+        entry = self._rates.setdefault(
+            segment.key, {"rate": slope, "weight": 0.0, "segments": 0}
+        )
+        # Recursive weighted least squares for a constant with forgetting
+        entry["weight"] = self._forgetting_factor * entry["weight"] + weight
+        entry["rate"] += (weight / entry["weight"]) * (slope - entry["rate"])
+        entry["segments"] += 1
+        _LOGGER.debug(
+            "Learned %s rate %.3f°C/h from %.3f°C/h over %d samples",
+            segment.key,
+            entry["rate"],
+            slope,
+            segment.count,
+        )
+
+    def rate(self, key) -> Optional[float]:
+        """Return the learned rate for a band in °C/h, if any."""
+        entry = self._rates.get(key)
+        if entry is None:
+            return None
+        return entry["rate"]
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the learned parameters for state attributes."""
+        return {
+            key: {
+                "rate": round(entry["rate"], 4),
+                "weight": round(entry["weight"], 4),
+                "segments": entry["segments"],
+            }
+            for key, entry in self._rates.items()
+        }
+
+    def restore(self, data):
+        """Restore learned parameters previously returned by ``as_dict``."""
+        if not isinstance(data, dict):
+            return
+        for key, entry in data.items():
+            try:
+                self._rates[key] = {
+                    "rate": float(entry["rate"]),
+                    "weight": float(entry["weight"]),
+                    "segments": int(entry["segments"]),
+                }
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid thermal model entry for %s", key)